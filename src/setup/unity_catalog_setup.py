@@ -18,17 +18,19 @@
 
 # COMMAND ----------
 
-# Environment configuration - change these based on your setup
-ENVIRONMENT = "dev"  # Options: dev, staging, prod
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Environment configuration - set through the notebook widget or job parameters
+dbutils.widgets.dropdown("environment", "dev", ["dev", "staging", "prod"])
+ENVIRONMENT = dbutils.widgets.get("environment")
 CATALOG_NAME = f"olist_{ENVIRONMENT}" if ENVIRONMENT != "prod" else "olist"
-STORAGE_LOCATION = f"/Volumes/{CATALOG_NAME}/raw/olist"
 
 # Schema names following medallion architecture
 SCHEMAS = ["raw", "bronze", "silver", "gold"]
 
 print(f"Environment: {ENVIRONMENT}")
 print(f"Catalog: {CATALOG_NAME}")
-print(f"Storage Location: {STORAGE_LOCATION}")
 
 # COMMAND ----------
 
@@ -52,11 +54,19 @@ print(f"Catalog '{CATALOG_NAME}' created and selected")
 
 # COMMAND ----------
 
-for schema in SCHEMAS:
-    spark.sql(f"""
-        CREATE SCHEMA IF NOT EXISTS {schema}
+schema_statements = [
+    f"""
+        CREATE SCHEMA IF NOT EXISTS {CATALOG_NAME}.{schema}
         COMMENT '{schema.capitalize()} layer for Olist data - {ENVIRONMENT.upper()}'
-    """)
+    """
+    for schema in SCHEMAS
+]
+
+# The schemas are independent, so submit the DDL concurrently instead of one metastore round-trip at a time
+with ThreadPoolExecutor(max_workers=len(schema_statements)) as executor:
+    list(executor.map(spark.sql, schema_statements))
+
+for schema in SCHEMAS:
     print(f"Schema '{CATALOG_NAME}.{schema}' created")
 
 # COMMAND ----------
@@ -98,9 +108,7 @@ print(f"Volume '{CATALOG_NAME}.raw.olist' created")
 
 # COMMAND ----------
 
-# Create directory structure using dbutils
-import os
-
+# Create the Volume directory structure
 base_path = f"/Volumes/{CATALOG_NAME}/raw/olist"
 
 # Main data directories (append-only entities)
@@ -122,16 +130,19 @@ cdc_entities = [
     "sellers"
 ]
 
-# Create main directories
-for entity in append_only_entities:
-    path = f"{base_path}/{entity}"
-    dbutils.fs.mkdirs(path)
-    print(f"Created: {path}")
+directory_paths = (
+    [f"{base_path}/{entity}" for entity in append_only_entities]
+    + [f"{base_path}/cdc/{entity}" for entity in cdc_entities]
+)
 
-# Create CDC directories
-for entity in cdc_entities:
-    path = f"{base_path}/cdc/{entity}"
-    dbutils.fs.mkdirs(path)
+# The Volume is FUSE-mounted, so create directories with os.makedirs instead of a
+# dbutils round-trip each. The shared cdc/ parent is created once up front so the
+# concurrent calls below only create leaf directories.
+os.makedirs(f"{base_path}/cdc", exist_ok=True)
+with ThreadPoolExecutor(max_workers=len(directory_paths)) as executor:
+    list(executor.map(lambda path: os.makedirs(path, exist_ok=True), directory_paths))
+
+for path in directory_paths:
     print(f"Created: {path}")
 
 print("\nDirectory structure created successfully!")
@@ -172,8 +183,18 @@ print("Permission grants template ready - uncomment and customize as needed")
 
 # COMMAND ----------
 
+# The verification queries are independent, so collect them concurrently
+verify_queries = [
+    "SHOW CATALOGS",
+    f"SHOW SCHEMAS IN {CATALOG_NAME}",
+    f"SHOW VOLUMES IN {CATALOG_NAME}.raw",
+]
+with ThreadPoolExecutor(max_workers=len(verify_queries)) as executor:
+    catalogs, schemas, volumes = executor.map(lambda query: spark.sql(query).collect(), verify_queries)
+
+# COMMAND ----------
+
 # Verify catalog
-catalogs = spark.sql("SHOW CATALOGS").collect()
 print("Available Catalogs:")
 for cat in catalogs:
     print(f"  - {cat.catalog}")
@@ -181,8 +202,6 @@ for cat in catalogs:
 # COMMAND ----------
 
 # Verify schemas
-spark.sql(f"USE CATALOG {CATALOG_NAME}")
-schemas = spark.sql("SHOW SCHEMAS").collect()
 print(f"\nSchemas in {CATALOG_NAME}:")
 for schema in schemas:
     print(f"  - {schema.databaseName}")
@@ -190,7 +209,6 @@ for schema in schemas:
 # COMMAND ----------
 
 # Verify volume
-volumes = spark.sql(f"SHOW VOLUMES IN {CATALOG_NAME}.raw").collect()
 print(f"\nVolumes in {CATALOG_NAME}.raw:")
 for vol in volumes:
     print(f"  - {vol.volume_name}")
@@ -220,29 +238,46 @@ for vol in volumes:
 # COMMAND ----------
 
 import os
+import json
+import hashlib
 import zipfile
 import shutil
 import tempfile
+import time
+from functools import lru_cache
 
 # Configuration for Kaggle download
 KAGGLE_DATASET = "olistbr/brazilian-ecommerce"
-DOWNLOAD_ENABLED = True  # Set to False to skip download
-
-# Mapping of Kaggle CSV files to Volume directories
+dbutils.widgets.dropdown("download_enabled", "true", ["true", "false"])
+DOWNLOAD_ENABLED = dbutils.widgets.get("download_enabled") == "true"  # Set to false to skip download
+UPLOAD_WORKERS = 8  # Concurrent file uploads to the Volume
+VERIFY_WORKERS = 16  # Concurrent directory listings when verifying the Volume
+DOWNLOAD_MAX_ATTEMPTS = 5  # Kaggle API attempts before giving up
+MANIFEST_PATH = f"{base_path}/.manifest.json"  # Sizes and checksums of the uploaded files
+
+# Mapping of Kaggle CSV files to (Volume directory, target filename)
 FILE_MAPPING = {
-    "olist_customers_dataset.csv": "customers",
-    "olist_orders_dataset.csv": "orders",
-    "olist_order_items_dataset.csv": "order_items",
-    "olist_order_payments_dataset.csv": "order_payments",
-    "olist_order_reviews_dataset.csv": "order_reviews",
-    "olist_products_dataset.csv": "products",
-    "olist_sellers_dataset.csv": "sellers",
-    "olist_geolocation_dataset.csv": "geolocation",
-    "product_category_name_translation.csv": "reference"  # Extra reference file
+    "olist_customers_dataset.csv": ("customers", "customers.csv"),
+    "olist_orders_dataset.csv": ("orders", "orders.csv"),
+    "olist_order_items_dataset.csv": ("order_items", "order_items.csv"),
+    "olist_order_payments_dataset.csv": ("order_payments", "order_payments.csv"),
+    "olist_order_reviews_dataset.csv": ("order_reviews", "order_reviews.csv"),
+    "olist_products_dataset.csv": ("products", "products.csv"),
+    "olist_sellers_dataset.csv": ("sellers", "sellers.csv"),
+    "olist_geolocation_dataset.csv": ("geolocation", "geolocation.csv"),
+    "product_category_name_translation.csv": ("reference", "product_category_name_translation.csv")  # Extra reference file
 }
 
 # COMMAND ----------
 
+@lru_cache(maxsize=1)
+def _get_kaggle_creds():
+    """Retrieve the Kaggle (username, key) pair from Databricks Secrets once per session."""
+    kaggle_username = dbutils.secrets.get(scope="kaggle", key="username")
+    kaggle_key = dbutils.secrets.get(scope="kaggle", key="key")
+    return kaggle_username, kaggle_key
+
+
 def setup_kaggle_credentials():
     """
     Configure Kaggle credentials from Databricks Secrets.
@@ -250,11 +285,17 @@ def setup_kaggle_credentials():
     The credentials are stored in the 'kaggle' secret scope with keys:
     - 'username': Your Kaggle username
     - 'key': Your Kaggle API key
+
+    Secrets are not fetched again when the credentials are already set in
+    the environment (e.g. on notebook re-runs).
     """
+    if os.environ.get("KAGGLE_USERNAME") and os.environ.get("KAGGLE_KEY"):
+        print("✓ Kaggle credentials already configured")
+        return True
+
     try:
         # Retrieve credentials from Databricks Secrets
-        kaggle_username = dbutils.secrets.get(scope="kaggle", key="username")
-        kaggle_key = dbutils.secrets.get(scope="kaggle", key="key")
+        kaggle_username, kaggle_key = _get_kaggle_creds()
 
         # Set environment variables for Kaggle API
         os.environ["KAGGLE_USERNAME"] = kaggle_username
@@ -272,16 +313,53 @@ def setup_kaggle_credentials():
 
 # COMMAND ----------
 
+def is_transient_download_error(error):
+    """
+    Decide whether a failed Kaggle download is worth retrying.
+
+    Only rate limiting (HTTP 429), server errors (5xx), and connection or
+    timeout failures are transient. Anything else - bad credentials, 403/404,
+    a wrong dataset slug - fails the same way on every attempt.
+    """
+    # kaggle's ApiException carries .status; requests' HTTPError carries .response
+    status = getattr(error, 'status', None)
+    if status is None:
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    if status is not None:
+        try:
+            status = int(status)
+        except (TypeError, ValueError):
+            return False
+        return status == 429 or 500 <= status < 600
+
+    transient_types = [ConnectionError, TimeoutError]
+    try:
+        import requests
+        transient_types += [requests.exceptions.ConnectionError, requests.exceptions.Timeout]
+    except ImportError:
+        pass
+    try:
+        import urllib3
+        transient_types += [urllib3.exceptions.ProtocolError, urllib3.exceptions.NewConnectionError,
+                            urllib3.exceptions.TimeoutError, urllib3.exceptions.MaxRetryError]
+    except ImportError:
+        pass
+    return isinstance(error, tuple(transient_types))
+
+
 def download_kaggle_dataset(dataset_name, download_path):
     """
-    Download and extract a Kaggle dataset.
+    Download a Kaggle dataset as a single zip archive.
+
+    The archive is not extracted to disk; its members are streamed straight
+    into the Volume by the caller.
 
     Args:
         dataset_name: Kaggle dataset identifier (e.g., 'olistbr/brazilian-ecommerce')
-        download_path: Local path to download and extract files
+        download_path: Local path to download the archive to
 
     Returns:
-        List of extracted file paths
+        Path to the downloaded zip archive
     """
     from kaggle.api.kaggle_api_extended import KaggleApi
 
@@ -292,54 +370,125 @@ def download_kaggle_dataset(dataset_name, download_path):
     print(f"Downloading dataset: {dataset_name}")
     print(f"Download path: {download_path}")
 
-    # Download the dataset (comes as a zip file)
-    api.dataset_download_files(
-        dataset=dataset_name,
-        path=download_path,
-        unzip=True
-    )
-
-    # List extracted files
-    extracted_files = []
-    for root, dirs, files in os.walk(download_path):
-        for file in files:
-            if file.endswith('.csv'):
-                extracted_files.append(os.path.join(root, file))
-                print(f"  ✓ Extracted: {file}")
-
-    return extracted_files
+    # Download the dataset (comes as a zip file named after the dataset slug),
+    # backing off on transient failures (HTTP 429, 5xx, connection errors) only
+    for attempt in range(1, DOWNLOAD_MAX_ATTEMPTS + 1):
+        try:
+            api.dataset_download_files(
+                dataset=dataset_name,
+                path=download_path,
+                unzip=False
+            )
+            break
+        except Exception as e:
+            if attempt == DOWNLOAD_MAX_ATTEMPTS or not is_transient_download_error(e):
+                raise
+            wait_seconds = min(4 * 2 ** (attempt - 1), 60)
+            print(f"  ⚠ Download attempt {attempt} failed ({e}); retrying in {wait_seconds}s")
+            time.sleep(wait_seconds)
+
+    zip_path = os.path.join(download_path, f"{dataset_name.split('/')[-1]}.zip")
+    print(f"  ✓ Downloaded: {os.path.basename(zip_path)}")
+
+    return zip_path
 
 # COMMAND ----------
 
-def upload_to_volume(local_path, volume_path, filename):
+def upload_to_volume(src_file, volume_path, filename):
     """
-    Upload a local file to a Databricks Volume using direct file I/O.
+    Stream a file object into a Databricks Volume using direct file I/O.
 
     Unity Catalog Volumes are FUSE-mounted, so we can use standard Python
-    file operations to read/write directly to the Volume path.
+    file operations to write directly to the Volume path. The content is
+    copied in fixed-size chunks, so memory use does not grow with file size,
+    and hashed on the way through so no second read is needed for the manifest.
 
     Args:
-        local_path: Path to the local file
+        src_file: Readable binary file object (e.g., a zip archive member)
         volume_path: Volume directory path (e.g., /Volumes/catalog/schema/volume/dir)
         filename: Target filename in the Volume
+
+    Returns:
+        Tuple of (target path, size in bytes, blake2b hex digest, elapsed seconds)
     """
+    start = time.perf_counter()
+
     # Ensure target directory exists
     os.makedirs(volume_path, exist_ok=True)
 
     target_path = f"{volume_path}/{filename}"
-
-    # Read file content into memory and write directly to Volume
-    with open(local_path, 'rb') as src_file:
-        file_content = src_file.read()
+    digest = hashlib.blake2b(digest_size=16)
+    size_bytes = 0
 
     with open(target_path, 'wb') as dst_file:
-        dst_file.write(file_content)
+        while chunk := src_file.read(1024 * 1024):
+            digest.update(chunk)
+            dst_file.write(chunk)
+            size_bytes += len(chunk)
 
-    file_size_kb = len(file_content) / 1024
-    print(f"  ✓ Uploaded to: {target_path} ({file_size_kb:.1f} KB)")
+    return target_path, size_bytes, digest.hexdigest(), time.perf_counter() - start
+
+
+def upload_archive_member(zip_path, member, volume_path, filename):
+    """
+    Stream a single zip archive member into a Databricks Volume.
+
+    Opens its own handle on the archive so that several members can be
+    uploaded concurrently from worker threads.
+
+    Args:
+        zip_path: Path to the local zip archive
+        member: Name of the archive member to upload
+        volume_path: Volume directory path
+        filename: Target filename in the Volume
+
+    Returns:
+        Tuple of (target path, size in bytes, blake2b hex digest, elapsed seconds)
+    """
+    with zipfile.ZipFile(zip_path) as archive, archive.open(member) as src_file:
+        return upload_to_volume(src_file, volume_path, filename)
 
 # COMMAND ----------
 
+def write_manifest(results):
+    """
+    Record the size and checksum of every uploaded file in the Volume manifest.
+
+    Args:
+        results: Upload results as returned by upload_to_volume
+    """
+    manifest = {
+        os.path.relpath(target_path, base_path): {"size": size_bytes, "blake2b": checksum}
+        for target_path, size_bytes, checksum, _ in results
+    }
+    with open(MANIFEST_PATH, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def dataset_already_uploaded():
+    """
+    Check whether every mapped dataset file is already present in the Volume.
+
+    Files are compared against the manifest written by the last successful
+    upload, so partially copied files are not mistaken for a complete dataset.
+
+    Returns:
+        True if all expected files exist with the sizes recorded in the manifest
+    """
+    try:
+        with open(MANIFEST_PATH) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return False
+
+    for target_dir, target_filename in FILE_MAPPING.values():
+        entry = manifest.get(f"{target_dir}/{target_filename}")
+        path = f"{base_path}/{target_dir}/{target_filename}"
+        if entry is None or not os.path.exists(path) or os.path.getsize(path) != entry["size"]:
+            return False
+    return True
+
+
 def download_and_upload_olist_dataset():
     """
     Main function to download Olist dataset from Kaggle and upload to Volumes.
@@ -348,6 +497,11 @@ def download_and_upload_olist_dataset():
     print("DOWNLOADING OLIST DATASET FROM KAGGLE")
     print("=" * 60)
 
+    # Re-runs do not need to fetch the archive again
+    if dataset_already_uploaded():
+        print("\n✓ Dataset already present in the Volume - skipping download")
+        return True
+
     # Step 1: Setup credentials
     if not setup_kaggle_credentials():
         print("\n⚠ Skipping download - credentials not configured")
@@ -360,35 +514,46 @@ def download_and_upload_olist_dataset():
     try:
         # Step 3: Download dataset
         print("\n--- Downloading Dataset ---")
-        extracted_files = download_kaggle_dataset(KAGGLE_DATASET, temp_dir)
+        zip_path = download_kaggle_dataset(KAGGLE_DATASET, temp_dir)
+
+        with zipfile.ZipFile(zip_path) as archive:
+            csv_members = [name for name in archive.namelist() if name.endswith('.csv')]
 
-        if not extracted_files:
-            print("⚠ No files were extracted from the dataset")
+        if not csv_members:
+            print("⚠ No CSV files were found in the dataset archive")
             return False
 
         # Step 4: Create reference directory if needed (using Python's os module)
         reference_path = f"{base_path}/reference"
         os.makedirs(reference_path, exist_ok=True)
 
-        # Step 5: Upload files to Volume
+        # Step 5: Stream archive members straight into the Volume
         print("\n--- Uploading to Volumes ---")
-        uploaded_count = 0
+        upload_tasks = []
 
-        for file_path in extracted_files:
-            filename = os.path.basename(file_path)
+        for member in csv_members:
+            filename = os.path.basename(member)
 
             if filename in FILE_MAPPING:
-                target_dir = FILE_MAPPING[filename]
+                target_dir, target_filename = FILE_MAPPING[filename]
                 volume_dir = f"{base_path}/{target_dir}"
 
-                # Rename to simpler names for consistency
-                target_filename = filename.replace("olist_", "").replace("_dataset", "")
-
-                upload_to_volume(file_path, volume_dir, target_filename)
-                uploaded_count += 1
+                upload_tasks.append((member, volume_dir, target_filename))
             else:
                 print(f"  ⚠ Skipped (unmapped): {filename}")
 
+        # Volume writes are network-bound, so upload the files in parallel
+        with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as executor:
+            results = list(executor.map(lambda task: upload_archive_member(zip_path, *task), upload_tasks))
+        uploaded_count = len(results)
+        write_manifest(results)
+
+        # Report all uploads at once instead of printing from the worker threads
+        print("\n".join(
+            f"  ✓ Uploaded to: {target_path} ({size_bytes / 1024:.1f} KB, {elapsed:.1f}s)"
+            for target_path, size_bytes, _, elapsed in results
+        ))
+
         print(f"\n✓ Successfully uploaded {uploaded_count} files to Volumes")
         return True
 
@@ -414,7 +579,7 @@ if DOWNLOAD_ENABLED:
         print("  https://www.kaggle.com/datasets/olistbr/brazilian-ecommerce")
         print(f"  and upload to: {base_path}/")
 else:
-    print("Dataset download is disabled. Set DOWNLOAD_ENABLED = True to enable.")
+    print("Dataset download is disabled. Set the download_enabled widget to true to enable.")
 
 # COMMAND ----------
 
@@ -427,15 +592,50 @@ else:
 print("Files in Volume after Kaggle download:")
 print("=" * 60)
 
-for entity in append_only_entities + ['reference']:
+def is_path_not_found(error):
+    """Whether a dbutils.fs error means the listed path does not exist."""
+    # dbutils surfaces the JVM's java.io.FileNotFoundException in the error message
+    return isinstance(error, FileNotFoundError) or "FileNotFoundException" in str(error)
+
+
+def list_if_exists(path):
+    """List a directory, returning None when it does not exist."""
     try:
-        files = dbutils.fs.ls(f"{base_path}/{entity}/")
-        print(f"\n{entity}/:")
+        return dbutils.fs.ls(path)
+    except Exception as e:
+        if is_path_not_found(e):
+            return None
+        raise
+
+
+# List the Volume root once, then the entity directories concurrently
+root_files = list_if_exists(f"{base_path}/")
+if root_files is None:
+    print(f"✗ Volume path not found: {base_path}/")
+    print('  Run the "Create External Volume for Raw Data" cell above, then re-run this cell.')
+else:
+    entity_dirs = [f for f in root_files if f.isDir()]
+    with ThreadPoolExecutor(max_workers=VERIFY_WORKERS) as executor:
+        listings = dict(zip(
+            [d.name.rstrip("/") for d in entity_dirs],
+            executor.map(lambda d: list_if_exists(d.path), entity_dirs),
+        ))
+
+    report_lines = []
+    for entity in append_only_entities + ['reference']:
+        files = listings.get(entity)
+        if files is None:
+            report_lines.append(f"\n{entity}/: (missing)")
+            continue
+        if not files:
+            report_lines.append(f"\n{entity}/: (empty)")
+            continue
+        report_lines.append(f"\n{entity}/:")
         for f in files:
             size_kb = f.size / 1024
-            print(f"  - {f.name} ({size_kb:.1f} KB)")
-    except Exception as e:
-        print(f"\n{entity}/: (empty or not created)")
+            report_lines.append(f"  - {f.name} ({size_kb:.1f} KB)")
+
+    print("\n".join(report_lines))
 
 # COMMAND ----------
 
@@ -21,9 +21,13 @@
 
 # COMMAND ----------
 
-import uuid
-import random
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from pyspark.sql import functions as F
 from pyspark.sql.types import *
 
@@ -31,6 +35,15 @@ from pyspark.sql.types import *
 CATALOG = dbutils.widgets.get("catalog")
 VOLUME_PATH = f"/Volumes/{CATALOG}/raw/olist"
 
+# Optional integer seed for reproducible runs; leave empty for fresh data every run
+dbutils.widgets.text("seed", "")
+SEED_TEXT = dbutils.widgets.get("seed").strip()
+if SEED_TEXT and not (SEED_TEXT.isascii() and SEED_TEXT.isdigit()):
+    raise ValueError(
+        f"Invalid 'seed' parameter {SEED_TEXT!r}: expected a non-negative integer, or empty for a random run"
+    )
+SEED = int(SEED_TEXT) if SEED_TEXT else None
+
 # Data generation settings
 INITIAL_CUSTOMERS = 1000
 INITIAL_PRODUCTS = 500
@@ -41,8 +54,13 @@ INITIAL_ORDERS = 5000
 CDC_BATCHES = 3
 CHANGES_PER_BATCH = 50
 
+# Output settings: files up to this many records are written from the driver with PyArrow
+LOCAL_WRITE_MAX_ROWS = 100_000
+
 print(f"Catalog: {CATALOG}")
 print(f"Volume Path: {VOLUME_PATH}")
+if SEED is not None:
+    print(f"Seed: {SEED} (same IDs as any earlier run with this seed - don't rerun it into the same volume)")
 
 # COMMAND ----------
 
@@ -86,54 +104,138 @@ ORDER_STATUSES = ['created', 'approved', 'invoiced', 'processing', 'shipped', 'd
 PAYMENT_TYPES = ['credit_card', 'boleto', 'voucher', 'debit_card']
 
 
+# Lookup tuples for scalar draws
+STATE_KEYS = tuple(BRAZILIAN_STATES)
+STATE_VALUES = tuple(BRAZILIAN_STATES.values())
+
+# Lookup arrays for vectorized sampling
+STATE_CODES = np.array(list(BRAZILIAN_STATES.keys()))
+STATE_CITIES = np.array(list(BRAZILIAN_STATES.values()))
+FIRST_NAMES = np.array(BRAZILIAN_FIRST_NAMES)
+LAST_NAMES = np.array(BRAZILIAN_LAST_NAMES)
+EMAIL_DOMAIN_ARRAY = np.array(EMAIL_DOMAINS)
+# Relative popularity of each EMAIL_DOMAINS entry among Brazilian addresses
+EMAIL_DOMAIN_WEIGHTS = np.array([0.5, 0.2, 0.15, 0.1, 0.05])
+# Separator between first and last name for each of the five email patterns
+EMAIL_SEPARATORS = np.array(['.', '', '.', '_', ''])
+
+# Shared NumPy generator (PCG64) behind every draw, seeded from the seed widget when set
+RNG = np.random.default_rng(SEED)
+
+
+class RandBuffer:
+    """
+    Serve scalar random draws from pre-filled NumPy blocks.
+
+    Mirrors the subset of the stdlib ``random`` API used by the generators, so
+    per-record loops pay for one list lookup per draw instead of a full
+    ``random`` call chain.
+    """
+
+    def __init__(self, rng, size=65536):
+        self._rng = rng
+        self._size = size
+        self._refill()
+
+    def _refill(self):
+        self._values = self._rng.random(self._size).tolist()
+        self._pos = 0
+
+    def random(self):
+        if self._pos == self._size:
+            self._refill()
+        value = self._values[self._pos]
+        self._pos += 1
+        return value
+
+    def uniform(self, a, b):
+        return a + (b - a) * self.random()
+
+    def randint(self, a, b):
+        return a + int(self.random() * (b - a + 1))
+
+    def choice(self, seq):
+        return seq[int(self.random() * len(seq))]
+
+
+RAND = RandBuffer(RNG)
+
+# Entity IDs follow the seed too, so rerunning a seed into the same volume lands duplicate
+# primary keys; unseeded runs keep drawing them from the OS
+ID_BYTES = RNG.bytes if SEED is not None else os.urandom
+
+
 def generate_uuid():
-    """Generate a 32-character UUID without hyphens."""
-    return uuid.uuid4().hex
+    """Generate a 32-character UUID without hyphens (always from the OS, e.g. for unique file names)."""
+    return os.urandom(16).hex()
 
 
-def random_brazilian_location():
-    """Generate random Brazilian state and city."""
-    state = random.choice(list(BRAZILIAN_STATES.keys()))
-    city = BRAZILIAN_STATES[state]
-    zip_prefix = random.randint(10000, 99999)
-    return state, city, zip_prefix
-
-
-def random_timestamp(start_date, end_date):
-    """Generate random timestamp between two dates."""
-    delta = end_date - start_date
-    random_days = random.randint(0, delta.days)
-    random_seconds = random.randint(0, 86400)
-    return start_date + timedelta(days=random_days, seconds=random_seconds)
-
-
-def generate_brazilian_name():
-    """Generate a random Brazilian full name."""
-    first_name = random.choice(BRAZILIAN_FIRST_NAMES)
-    last_name = random.choice(BRAZILIAN_LAST_NAMES)
-    return first_name, last_name
-
-
-def generate_email(first_name, last_name):
-    """Generate a realistic email address based on name."""
-    domain = random.choice(EMAIL_DOMAINS)
-    patterns = [
-        f"{first_name.lower()}.{last_name.lower()}",
-        f"{first_name.lower()}{last_name.lower()}",
-        f"{first_name.lower()}.{last_name.lower()}{random.randint(10, 99)}",
-        f"{first_name.lower()}_{last_name.lower()}",
-        f"{first_name.lower()[0]}{last_name.lower()}"
-    ]
-    local_part = random.choice(patterns)
-    return f"{local_part}@{domain}"
+def generate_uuids(count):
+    """Generate a list of 32-character hex IDs from a single ID_BYTES call."""
+    hex_digits = ID_BYTES(16 * count).hex()
+    return [hex_digits[i:i + 32] for i in range(0, 32 * count, 32)]
+
+
+def random_brazilian_locations(count):
+    """Generate random Brazilian states, cities, and zip prefixes as parallel arrays."""
+    state_idx = RNG.integers(0, len(STATE_CODES), count)
+    zip_prefixes = RNG.integers(10000, 100000, count)
+    return STATE_CODES[state_idx], STATE_CITIES[state_idx], zip_prefixes
+
+
+def generate_brazilian_names(count):
+    """Generate random Brazilian first and last names as parallel arrays."""
+    first_names = FIRST_NAMES[RNG.integers(0, len(FIRST_NAMES), count)]
+    last_names = LAST_NAMES[RNG.integers(0, len(LAST_NAMES), count)]
+    return first_names, last_names
+
+
+def iso_timestamps(timestamps, keep=None):
+    """Format datetime64 values as ISO-8601 strings; entries where keep is False become None."""
+    strings = np.datetime_as_string(timestamps, unit='s')
+    return strings if keep is None else np.where(keep, strings, None)
+
+
+def concat_strings(*parts):
+    """Element-wise concatenation of string arrays (and scalar strings)."""
+    result = parts[0]
+    for part in parts[1:]:
+        result = np.char.add(result, part)
+    return result
+
+
+def generate_emails(first_names, last_names):
+    """Generate a realistic email address for each (first, last) name pair."""
+    count = len(first_names)
+    first = np.char.lower(first_names)
+    last = np.char.lower(last_names)
+    pattern = RNG.integers(0, len(EMAIL_SEPARATORS), count)
+    # Pattern 4 uses the first initial; pattern 2 adds a two-digit suffix
+    prefix = np.where(pattern == 4, first.astype('<U1'), first)
+    suffix = np.where(pattern == 2, RNG.integers(10, 100, count).astype(str), '')
+    domains = RNG.choice(EMAIL_DOMAIN_ARRAY, count, p=EMAIL_DOMAIN_WEIGHTS)
+    return concat_strings(prefix, EMAIL_SEPARATORS[pattern], last, suffix, '@', domains)
+
+
+def generate_phones(count):
+    """Generate Brazilian mobile phone numbers."""
+    ddd = RNG.integers(11, 100, count).astype(str)
+    first_part = RNG.integers(1000, 10000, count).astype(str)
+    second_part = RNG.integers(1000, 10000, count).astype(str)
+    return concat_strings('+55 (', ddd, ') 9', first_part, '-', second_part)
 
 
-def generate_phone():
-    """Generate a Brazilian mobile phone number."""
-    ddd = random.randint(11, 99)
-    first_part = random.randint(1000, 9999)
-    second_part = random.randint(1000, 9999)
-    return f"+55 ({ddd}) 9{first_part}-{second_part}"
+def row_count(data):
+    """Number of records in a list of records or a dict of column arrays."""
+    if isinstance(data, dict):
+        return len(next(iter(data.values()), ()))
+    return len(data)
+
+
+def random_brazilian_location():
+    """Generate random Brazilian state and city."""
+    i = RAND.randint(0, len(STATE_KEYS) - 1)
+    return STATE_KEYS[i], STATE_VALUES[i], RAND.randint(10000, 99999)
 
 # COMMAND ----------
 
@@ -143,136 +245,151 @@ def generate_phone():
 # COMMAND ----------
 
 def generate_customers(count):
-    """Generate initial customer data with PII fields."""
-    customers = []
-    for _ in range(count):
-        state, city, zip_prefix = random_brazilian_location()
-        first_name, last_name = generate_brazilian_name()
-        customers.append({
-            'customer_id': generate_uuid(),
-            'customer_unique_id': generate_uuid(),
-            'customer_zip_code_prefix': zip_prefix,
-            'customer_city': city,
-            'customer_state': state,
-            'customer_name': f"{first_name} {last_name}",
-            'customer_email': generate_email(first_name, last_name),
-            'customer_phone': generate_phone()
-        })
-    return customers
+    """Generate initial customer data with PII fields, as a dict of column arrays."""
+    states, cities, zip_prefixes = random_brazilian_locations(count)
+    first_names, last_names = generate_brazilian_names(count)
+    return {
+        'customer_id': np.array(generate_uuids(count)),
+        'customer_unique_id': np.array(generate_uuids(count)),
+        'customer_zip_code_prefix': zip_prefixes,
+        'customer_city': cities,
+        'customer_state': states,
+        'customer_name': concat_strings(first_names, ' ', last_names),
+        'customer_email': generate_emails(first_names, last_names),
+        'customer_phone': generate_phones(count)
+    }
 
 
 def generate_products(count):
-    """Generate initial product data."""
-    products = []
-    for _ in range(count):
-        products.append({
-            'product_id': generate_uuid(),
-            'product_category_name': random.choice(PRODUCT_CATEGORIES),
-            'product_name_lenght': random.randint(10, 100),
-            'product_description_lenght': random.randint(50, 500),
-            'product_photos_qty': random.randint(1, 10),
-            'product_weight_g': random.randint(100, 50000),
-            'product_length_cm': random.randint(5, 100),
-            'product_height_cm': random.randint(5, 100),
-            'product_width_cm': random.randint(5, 100)
-        })
-    return products
+    """Generate initial product data, as a dict of column arrays."""
+    return {
+        'product_id': np.array(generate_uuids(count)),
+        'product_category_name': np.array(PRODUCT_CATEGORIES)[RNG.integers(0, len(PRODUCT_CATEGORIES), count)],
+        'product_name_lenght': RNG.integers(10, 101, count),
+        'product_description_lenght': RNG.integers(50, 501, count),
+        'product_photos_qty': RNG.integers(1, 11, count),
+        'product_weight_g': RNG.integers(100, 50001, count),
+        'product_length_cm': RNG.integers(5, 101, count),
+        'product_height_cm': RNG.integers(5, 101, count),
+        'product_width_cm': RNG.integers(5, 101, count)
+    }
 
 
 def generate_sellers(count):
-    """Generate initial seller data."""
-    sellers = []
-    for _ in range(count):
-        state, city, zip_prefix = random_brazilian_location()
-        sellers.append({
-            'seller_id': generate_uuid(),
-            'seller_zip_code_prefix': zip_prefix,
-            'seller_city': city,
-            'seller_state': state
-        })
-    return sellers
-
-
-def generate_geolocation():
-    """Generate geolocation reference data."""
-    geolocations = []
-    for state, city in BRAZILIAN_STATES.items():
-        for _ in range(10):
-            zip_prefix = random.randint(10000, 99999)
-            geolocations.append({
-                'geolocation_zip_code_prefix': zip_prefix,
-                'geolocation_lat': random.uniform(-30, -5),
-                'geolocation_lng': random.uniform(-55, -35),
-                'geolocation_city': city,
-                'geolocation_state': state
-            })
-    return geolocations
+    """Generate initial seller data, as a dict of column arrays."""
+    states, cities, zip_prefixes = random_brazilian_locations(count)
+    return {
+        'seller_id': np.array(generate_uuids(count)),
+        'seller_zip_code_prefix': zip_prefixes,
+        'seller_city': cities,
+        'seller_state': states
+    }
+
+
+def generate_geolocation(per_state=10):
+    """Generate geolocation reference data, per_state rows per state, as a dict of column arrays."""
+    count = len(STATE_CODES) * per_state
+    return {
+        'geolocation_zip_code_prefix': RNG.integers(10000, 100000, count),
+        'geolocation_lat': RNG.uniform(-30, -5, count),
+        'geolocation_lng': RNG.uniform(-55, -35, count),
+        'geolocation_city': np.repeat(STATE_CITIES, per_state),
+        'geolocation_state': np.repeat(STATE_CODES, per_state)
+    }
 
 # COMMAND ----------
 
 def generate_orders(count, customer_ids, seller_ids, product_ids):
-    """Generate order data with related items, payments, and reviews."""
-    orders = []
-    order_items = []
-    order_payments = []
-    order_reviews = []
+    """
+    Generate order data with related items, payments, and reviews.
 
+    Each table is returned as a dict of column arrays.
+    """
     start_date = datetime(2017, 1, 1)
     end_date = datetime(2018, 12, 31)
 
-    for _ in range(count):
-        order_id = generate_uuid()
-        customer_id = random.choice(customer_ids)
-        purchase_time = random_timestamp(start_date, end_date)
-        status = random.choice(ORDER_STATUSES)
-
-        order = {
-            'order_id': order_id,
-            'customer_id': customer_id,
-            'order_status': status,
-            'order_purchase_timestamp': purchase_time.isoformat(),
-            'order_approved_at': (purchase_time + timedelta(hours=random.randint(1, 24))).isoformat() if status != 'created' else None,
-            'order_delivered_carrier_date': (purchase_time + timedelta(days=random.randint(1, 5))).isoformat() if status in ['shipped', 'delivered'] else None,
-            'order_delivered_customer_date': (purchase_time + timedelta(days=random.randint(5, 30))).isoformat() if status == 'delivered' else None,
-            'order_estimated_delivery_date': (purchase_time + timedelta(days=random.randint(7, 45))).isoformat()
-        }
-        orders.append(order)
-
-        num_items = random.randint(1, 5)
-        for item_id in range(1, num_items + 1):
-            order_items.append({
-                'order_id': order_id,
-                'order_item_id': item_id,
-                'product_id': random.choice(product_ids),
-                'seller_id': random.choice(seller_ids),
-                'shipping_limit_date': (purchase_time + timedelta(days=random.randint(1, 7))).isoformat(),
-                'price': round(random.uniform(10, 1000), 2),
-                'freight_value': round(random.uniform(5, 100), 2)
-            })
-
-        num_payments = random.randint(1, 3)
-        total_value = sum(item['price'] + item['freight_value'] for item in order_items if item['order_id'] == order_id)
-        payment_per = total_value / num_payments
-        for seq in range(1, num_payments + 1):
-            order_payments.append({
-                'order_id': order_id,
-                'payment_sequential': seq,
-                'payment_type': random.choice(PAYMENT_TYPES),
-                'payment_installments': random.randint(1, 12),
-                'payment_value': round(payment_per, 2)
-            })
-
-        if status == 'delivered' and random.random() > 0.3:
-            review_date = purchase_time + timedelta(days=random.randint(10, 60))
-            order_reviews.append({
-                'review_id': generate_uuid(),
-                'order_id': order_id,
-                'review_score': random.randint(1, 5),
-                'review_comment_title': 'Review Title' if random.random() > 0.5 else None,
-                'review_comment_message': 'This is a review comment.' if random.random() > 0.5 else None,
-                'review_creation_date': review_date.isoformat(),
-                'review_answer_timestamp': (review_date + timedelta(days=random.randint(1, 7))).isoformat()
-            })
+    # Draw the numeric core of every order up front
+    purchase_seconds = RNG.integers(0, (end_date - start_date).days + 1, count) * 86400 + RNG.integers(0, 86401, count)
+    status_idx = RNG.integers(0, len(ORDER_STATUSES), count)
+    approved_hours = RNG.integers(1, 25, count)
+    carrier_days = RNG.integers(1, 6, count)
+    delivered_days = RNG.integers(5, 31, count)
+    estimated_days = RNG.integers(7, 46, count)
+    item_counts = RNG.integers(1, 6, count)
+
+    order_ids = np.array(generate_uuids(count))
+    statuses = np.array(ORDER_STATUSES)[status_idx]
+    purchase_ts = np.datetime64(start_date, 's') + purchase_seconds.astype('timedelta64[s]')
+
+    orders = {
+        'order_id': order_ids,
+        'customer_id': RNG.choice(customer_ids, count),
+        'order_status': statuses,
+        'order_purchase_timestamp': iso_timestamps(purchase_ts),
+        'order_approved_at': iso_timestamps(
+            purchase_ts + approved_hours.astype('timedelta64[h]'), statuses != 'created'
+        ),
+        'order_delivered_carrier_date': iso_timestamps(
+            purchase_ts + carrier_days.astype('timedelta64[D]'), np.isin(statuses, ['shipped', 'delivered'])
+        ),
+        'order_delivered_customer_date': iso_timestamps(
+            purchase_ts + delivered_days.astype('timedelta64[D]'), statuses == 'delivered'
+        ),
+        'order_estimated_delivery_date': iso_timestamps(purchase_ts + estimated_days.astype('timedelta64[D]'))
+    }
+
+    # Items are laid out contiguously per order
+    total_items = int(item_counts.sum())
+    item_starts = np.cumsum(item_counts) - item_counts
+    item_order_idx = np.repeat(np.arange(count), item_counts)
+    item_prices = np.round(RNG.uniform(10, 1000, total_items), 2)
+    item_freights = np.round(RNG.uniform(5, 100, total_items), 2)
+
+    order_items = {
+        'order_id': order_ids[item_order_idx],
+        'order_item_id': np.arange(total_items) - item_starts[item_order_idx] + 1,
+        'product_id': RNG.choice(product_ids, total_items),
+        'seller_id': RNG.choice(seller_ids, total_items),
+        'shipping_limit_date': iso_timestamps(
+            purchase_ts[item_order_idx] + RNG.integers(1, 8, total_items).astype('timedelta64[D]')
+        ),
+        'price': item_prices,
+        'freight_value': item_freights
+    }
+
+    # Order totals straight from each order's contiguous item slice
+    order_totals = np.add.reduceat(item_prices + item_freights, item_starts)
+
+    # Payment counts are drawn up front, so the payment columns are built at their final length
+    payment_counts = RNG.integers(1, 4, count)
+    total_payments = int(payment_counts.sum())
+    payment_order_idx = np.repeat(np.arange(count), payment_counts)
+    payment_starts = np.cumsum(payment_counts) - payment_counts
+
+    order_payments = {
+        'order_id': order_ids[payment_order_idx],
+        'payment_sequential': np.arange(total_payments) - payment_starts[payment_order_idx] + 1,
+        'payment_type': np.array(PAYMENT_TYPES)[RNG.integers(0, len(PAYMENT_TYPES), total_payments)],
+        'payment_installments': RNG.integers(1, 13, total_payments),
+        'payment_value': np.round(order_totals / payment_counts, 2)[payment_order_idx]
+    }
+
+    # Roughly 70% of delivered orders get a review
+    reviewed = np.flatnonzero((statuses == 'delivered') & (RNG.random(count) > 0.3))
+    review_count = len(reviewed)
+    review_dates = purchase_ts[reviewed] + RNG.integers(10, 61, review_count).astype('timedelta64[D]')
+
+    order_reviews = {
+        'review_id': np.array(generate_uuids(review_count)),
+        'order_id': order_ids[reviewed],
+        'review_score': RNG.integers(1, 6, review_count),
+        'review_comment_title': np.where(RNG.random(review_count) > 0.5, 'Review Title', None),
+        'review_comment_message': np.where(RNG.random(review_count) > 0.5, 'This is a review comment.', None),
+        'review_creation_date': iso_timestamps(review_dates),
+        'review_answer_timestamp': iso_timestamps(
+            review_dates + RNG.integers(1, 8, review_count).astype('timedelta64[D]')
+        )
+    }
 
     return orders, order_items, order_payments, order_reviews
 
@@ -287,95 +404,146 @@ def generate_cdc_batch(existing_records, entity_type, batch_num, changes_count):
     """
     Generate CDC change events for a batch.
 
-    Returns list of change events with:
+    existing_records is a dict of column arrays and is not modified.
+
+    Returns a tuple of (changes, inserted_records), where changes is a list of
+    change events with:
     - sequence_number: Monotonically increasing sequence
     - operation: INSERT, UPDATE, or DELETE
     - change_timestamp: When the change occurred
     - All entity fields
+
+    and inserted_records holds the new records, for the caller to append with
+    append_records before the next batch.
     """
     changes = []
+    inserted_records = []
+    existing_count = row_count(existing_records)
     base_sequence = batch_num * 10000
-    base_time = datetime.now() + timedelta(hours=batch_num)
-
-    for i in range(changes_count):
+    base_time = np.datetime64(datetime.now() + timedelta(hours=batch_num), 'us')
+    # One change per second from the batch start, formatted in one call
+    change_timestamps = np.datetime_as_string(
+        base_time + np.arange(changes_count).astype('timedelta64[s]'), unit='us'
+    ).tolist()
+    # Enough IDs for every change to be an insert (customers need two each)
+    new_ids = iter(generate_uuids(2 * changes_count))
+
+    # Operation and target-record draws for the whole batch
+    operation_rolls = RNG.random(changes_count).tolist()
+    pick_rolls = RNG.random(changes_count).tolist()
+    # Which customer updates also change the email / phone
+    email_changes = (RNG.random(changes_count) < 0.3).tolist()
+    phone_changes = (RNG.random(changes_count) < 0.2).tolist()
+
+    if entity_type == 'customers':
+        # PII for inserts and updates, built as whole-batch string arrays
+        first_names, last_names = generate_brazilian_names(changes_count)
+        new_names = concat_strings(first_names, ' ', last_names).tolist()
+        new_emails = generate_emails(first_names, last_names).tolist()
+        new_phones = generate_phones(changes_count).tolist()
+
+    def pick_record(roll):
+        # Gather one row from the column arrays (or this batch's inserts) as plain Python values.
+        # The result is only read: changed fields are layered on top when building the event.
+        idx = int(roll * (existing_count + len(inserted_records)))
+        if idx >= existing_count:
+            return inserted_records[idx - existing_count]
+        return {column: values[idx].item() for column, values in existing_records.items()}
+
+    for i, (operation_roll, pick_roll) in enumerate(zip(operation_rolls, pick_rolls)):
         sequence_number = base_sequence + i
-        change_time = base_time + timedelta(seconds=i)
+        has_records = existing_count + len(inserted_records) > 0
 
-        operation_roll = random.random()
-        if operation_roll < 0.6 and existing_records:
+        if operation_roll < 0.6 and has_records:
             operation = 'UPDATE'
-            record = random.choice(existing_records).copy()
+            record = pick_record(pick_roll)
         elif operation_roll < 0.9:
             operation = 'INSERT'
             if entity_type == 'customers':
                 state, city, zip_prefix = random_brazilian_location()
-                first_name, last_name = generate_brazilian_name()
                 record = {
-                    'customer_id': generate_uuid(),
-                    'customer_unique_id': generate_uuid(),
+                    'customer_id': next(new_ids),
+                    'customer_unique_id': next(new_ids),
                     'customer_zip_code_prefix': zip_prefix,
                     'customer_city': city,
                     'customer_state': state,
-                    'customer_name': f"{first_name} {last_name}",
-                    'customer_email': generate_email(first_name, last_name),
-                    'customer_phone': generate_phone()
+                    'customer_name': new_names[i],
+                    'customer_email': new_emails[i],
+                    'customer_phone': new_phones[i]
                 }
             elif entity_type == 'products':
                 record = {
-                    'product_id': generate_uuid(),
-                    'product_category_name': random.choice(PRODUCT_CATEGORIES),
-                    'product_name_lenght': random.randint(10, 100),
-                    'product_description_lenght': random.randint(50, 500),
-                    'product_photos_qty': random.randint(1, 10),
-                    'product_weight_g': random.randint(100, 50000),
-                    'product_length_cm': random.randint(5, 100),
-                    'product_height_cm': random.randint(5, 100),
-                    'product_width_cm': random.randint(5, 100)
+                    'product_id': next(new_ids),
+                    'product_category_name': RAND.choice(PRODUCT_CATEGORIES),
+                    'product_name_lenght': RAND.randint(10, 100),
+                    'product_description_lenght': RAND.randint(50, 500),
+                    'product_photos_qty': RAND.randint(1, 10),
+                    'product_weight_g': RAND.randint(100, 50000),
+                    'product_length_cm': RAND.randint(5, 100),
+                    'product_height_cm': RAND.randint(5, 100),
+                    'product_width_cm': RAND.randint(5, 100)
                 }
             elif entity_type == 'sellers':
                 state, city, zip_prefix = random_brazilian_location()
                 record = {
-                    'seller_id': generate_uuid(),
+                    'seller_id': next(new_ids),
                     'seller_zip_code_prefix': zip_prefix,
                     'seller_city': city,
                     'seller_state': state
                 }
-            existing_records.append(record)
+            inserted_records.append(record)
         else:
-            if existing_records:
+            if has_records:
                 operation = 'DELETE'
-                record = random.choice(existing_records).copy()
+                record = pick_record(pick_roll)
             else:
                 continue
 
+        updates = {}
         if operation == 'UPDATE':
             if entity_type == 'customers':
                 state, city, zip_prefix = random_brazilian_location()
-                record['customer_city'] = city
-                record['customer_state'] = state
-                record['customer_zip_code_prefix'] = zip_prefix
-                if random.random() < 0.3:
-                    first_name, last_name = generate_brazilian_name()
-                    record['customer_email'] = generate_email(first_name, last_name)
-                if random.random() < 0.2:
-                    record['customer_phone'] = generate_phone()
+                updates = {
+                    'customer_city': city,
+                    'customer_state': state,
+                    'customer_zip_code_prefix': zip_prefix
+                }
+                if email_changes[i]:
+                    updates['customer_email'] = new_emails[i]
+                if phone_changes[i]:
+                    updates['customer_phone'] = new_phones[i]
             elif entity_type == 'products':
-                record['product_category_name'] = random.choice(PRODUCT_CATEGORIES)
-                record['product_weight_g'] = random.randint(100, 50000)
+                updates = {
+                    'product_category_name': RAND.choice(PRODUCT_CATEGORIES),
+                    'product_weight_g': RAND.randint(100, 50000)
+                }
             elif entity_type == 'sellers':
                 state, city, zip_prefix = random_brazilian_location()
-                record['seller_city'] = city
-                record['seller_state'] = state
+                updates = {
+                    'seller_city': city,
+                    'seller_state': state
+                }
 
         change_record = {
             'sequence_number': sequence_number,
             'operation': operation,
-            'change_timestamp': change_time.isoformat(),
-            **record
+            'change_timestamp': change_timestamps[i],
+            **record,
+            **updates
         }
         changes.append(change_record)
 
-    return changes
+    return changes, inserted_records
+
+
+def append_records(columns, records):
+    """Return a new dict of column arrays with the given records appended."""
+    if not records:
+        return columns
+    return {
+        column: np.concatenate([values, [record[column] for record in records]])
+        for column, values in columns.items()
+    }
 
 # COMMAND ----------
 
@@ -384,17 +552,53 @@ def generate_cdc_batch(existing_records, entity_type, batch_num, changes_count):
 
 # COMMAND ----------
 
+# Spark types for the Arrow column types the generators produce; anything else
+# (e.g. an all-null column) is written as a string
+ARROW_TO_SPARK_TYPES = {
+    pa.string(): StringType(),
+    pa.int64(): LongType(),
+    pa.float64(): DoubleType(),
+    pa.bool_(): BooleanType()
+}
+
+
+def spark_schema(table):
+    """Build an explicit Spark schema from an Arrow table, so createDataFrame skips type inference."""
+    return StructType([
+        StructField(field.name, ARROW_TO_SPARK_TYPES.get(field.type, StringType()), field.nullable)
+        for field in table.schema
+    ])
+
+
 def save_to_csv(data, path, filename):
-    """Save data to CSV in the specified volume path."""
-    if not data:
-        print(f"No data to save for {filename}")
-        return
+    """
+    Save data to CSV in the specified volume path.
+
+    Small outputs (up to LOCAL_WRITE_MAX_ROWS records) are written straight to the
+    FUSE-mounted Volume with PyArrow's CSV writer, avoiding a Spark job per file.
+    The layout matches Spark's CSV writer - a directory holding one uniquely named
+    part file - so Auto Loader still picks up every run as a new file.
+
+    data may be a list of records or a dict of column arrays. Returns a status
+    message instead of printing, so concurrent saves can be reported in order.
+    """
+    record_count = row_count(data)
+    if not record_count:
+        return f"No data to save for {filename}"
 
-    df = spark.createDataFrame(data)
     full_path = f"{path}/{filename}"
+    table = pa.table(data) if isinstance(data, dict) else pa.Table.from_pylist(data)
 
-    df.coalesce(1).write.mode("overwrite").option("header", "true").csv(full_path)
-    print(f"Saved {len(data)} records to {full_path}")
+    if record_count > LOCAL_WRITE_MAX_ROWS:
+        df = spark.createDataFrame(table.to_pandas(), schema=spark_schema(table))
+        df.coalesce(1).write.mode("overwrite").option("header", "true").csv(full_path)
+    else:
+        # Same semantics as mode("overwrite"): replace the directory and its part files
+        shutil.rmtree(full_path, ignore_errors=True)
+        os.makedirs(full_path)
+        pacsv.write_csv(table, f"{full_path}/part-00000-{generate_uuid()}.csv")
+
+    return f"Saved {record_count} records to {full_path}"
 
 # COMMAND ----------
 
@@ -412,23 +616,24 @@ products = generate_products(INITIAL_PRODUCTS)
 sellers = generate_sellers(INITIAL_SELLERS)
 geolocations = generate_geolocation()
 
-customer_ids = [c['customer_id'] for c in customers]
-product_ids = [p['product_id'] for p in products]
-seller_ids = [s['seller_id'] for s in sellers]
+# ID columns stay NumPy arrays, so generate_orders samples them with a single gather each
+customer_ids = customers['customer_id']
+product_ids = products['product_id']
+seller_ids = sellers['seller_id']
 
 orders, order_items, order_payments, order_reviews = generate_orders(
     INITIAL_ORDERS, customer_ids, seller_ids, product_ids
 )
 
 print(f"\nGenerated:")
-print(f"  - {len(customers)} customers (with PII: name, email, phone)")
-print(f"  - {len(products)} products")
-print(f"  - {len(sellers)} sellers")
-print(f"  - {len(geolocations)} geolocation records")
-print(f"  - {len(orders)} orders")
-print(f"  - {len(order_items)} order items")
-print(f"  - {len(order_payments)} order payments")
-print(f"  - {len(order_reviews)} order reviews")
+print(f"  - {row_count(customers)} customers (with PII: name, email, phone)")
+print(f"  - {row_count(products)} products")
+print(f"  - {row_count(sellers)} sellers")
+print(f"  - {row_count(geolocations)} geolocation records")
+print(f"  - {row_count(orders)} orders")
+print(f"  - {row_count(order_items)} order items")
+print(f"  - {row_count(order_payments)} order payments")
+print(f"  - {row_count(order_reviews)} order reviews")
 
 # COMMAND ----------
 
@@ -436,14 +641,20 @@ print("\n" + "=" * 60)
 print("SAVING INITIAL LOAD DATA")
 print("=" * 60)
 
-save_to_csv(customers, f"{VOLUME_PATH}/customers", "customers_initial.csv")
-save_to_csv(products, f"{VOLUME_PATH}/products", "products_initial.csv")
-save_to_csv(sellers, f"{VOLUME_PATH}/sellers", "sellers_initial.csv")
-save_to_csv(geolocations, f"{VOLUME_PATH}/geolocation", "geolocation_initial.csv")
-save_to_csv(orders, f"{VOLUME_PATH}/orders", "orders_initial.csv")
-save_to_csv(order_items, f"{VOLUME_PATH}/order_items", "order_items_initial.csv")
-save_to_csv(order_payments, f"{VOLUME_PATH}/order_payments", "order_payments_initial.csv")
-save_to_csv(order_reviews, f"{VOLUME_PATH}/order_reviews", "order_reviews_initial.csv")
+initial_writes = [
+    (customers, f"{VOLUME_PATH}/customers", "customers_initial.csv"),
+    (products, f"{VOLUME_PATH}/products", "products_initial.csv"),
+    (sellers, f"{VOLUME_PATH}/sellers", "sellers_initial.csv"),
+    (geolocations, f"{VOLUME_PATH}/geolocation", "geolocation_initial.csv"),
+    (orders, f"{VOLUME_PATH}/orders", "orders_initial.csv"),
+    (order_items, f"{VOLUME_PATH}/order_items", "order_items_initial.csv"),
+    (order_payments, f"{VOLUME_PATH}/order_payments", "order_payments_initial.csv"),
+    (order_reviews, f"{VOLUME_PATH}/order_reviews", "order_reviews_initial.csv"),
+]
+
+# Each file goes to its own directory, so run the writes concurrently
+with ThreadPoolExecutor(max_workers=len(initial_writes)) as executor:
+    print("\n".join(executor.map(lambda args: save_to_csv(*args), initial_writes)))
 
 # COMMAND ----------
 
@@ -454,13 +665,24 @@ print("=" * 60)
 for batch in range(CDC_BATCHES):
     print(f"\n--- Batch {batch + 1} ---")
 
-    customer_changes = generate_cdc_batch(customers, 'customers', batch, CHANGES_PER_BATCH)
-    product_changes = generate_cdc_batch(products, 'products', batch, CHANGES_PER_BATCH)
-    seller_changes = generate_cdc_batch(sellers, 'sellers', batch, CHANGES_PER_BATCH)
+    customer_changes, customer_inserts = generate_cdc_batch(customers, 'customers', batch, CHANGES_PER_BATCH)
+    product_changes, product_inserts = generate_cdc_batch(products, 'products', batch, CHANGES_PER_BATCH)
+    seller_changes, seller_inserts = generate_cdc_batch(sellers, 'sellers', batch, CHANGES_PER_BATCH)
+
+    # Later batches can update or delete the records inserted by this one
+    customers = append_records(customers, customer_inserts)
+    products = append_records(products, product_inserts)
+    sellers = append_records(sellers, seller_inserts)
+
+    cdc_writes = [
+        (customer_changes, f"{VOLUME_PATH}/cdc/customers", f"customers_cdc_batch_{batch + 1}.csv"),
+        (product_changes, f"{VOLUME_PATH}/cdc/products", f"products_cdc_batch_{batch + 1}.csv"),
+        (seller_changes, f"{VOLUME_PATH}/cdc/sellers", f"sellers_cdc_batch_{batch + 1}.csv"),
+    ]
 
-    save_to_csv(customer_changes, f"{VOLUME_PATH}/cdc/customers", f"customers_cdc_batch_{batch + 1}.csv")
-    save_to_csv(product_changes, f"{VOLUME_PATH}/cdc/products", f"products_cdc_batch_{batch + 1}.csv")
-    save_to_csv(seller_changes, f"{VOLUME_PATH}/cdc/sellers", f"sellers_cdc_batch_{batch + 1}.csv")
+    # The entity writes are independent, so run them concurrently
+    with ThreadPoolExecutor(max_workers=len(cdc_writes)) as executor:
+        print("\n".join(executor.map(lambda args: save_to_csv(*args), cdc_writes)))
 
 print("\n" + "=" * 60)
 print("DATA GENERATION COMPLETE!")
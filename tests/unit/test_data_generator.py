@@ -5,9 +5,13 @@ These tests verify the logic patterns used in data_generator.py
 without requiring a Spark session or Databricks environment.
 """
 
+import os
 import random
-import uuid
 import re
+from datetime import datetime
+
+import numpy as np
+import pytest
 
 # ============================================================================
 # Helper functions (patterns from data_generator.py)
@@ -25,62 +29,153 @@ BRAZILIAN_LAST_NAMES = [
 ]
 
 EMAIL_DOMAINS = ['gmail.com', 'hotmail.com', 'yahoo.com.br', 'outlook.com', 'uol.com.br']
+# Relative popularity of each EMAIL_DOMAINS entry among Brazilian addresses
+EMAIL_DOMAIN_WEIGHTS = np.array([0.5, 0.2, 0.15, 0.1, 0.05])
 
+# Separator between first and last name for each of the five email patterns
+EMAIL_SEPARATORS = np.array(['.', '', '.', '_', ''])
 
-def generate_uuid():
-    """Generate a 32-character UUID without hyphens."""
-    return uuid.uuid4().hex
+# 32 lowercase hex characters, the format of every generated ID
+HEX32 = re.compile(r"[0-9a-f]{32}")
+
+# Brazilian mobile number, capturing the two-digit area code (DDD)
+BRAZILIAN_PHONE = re.compile(r"\+55 \((\d{2})\) 9\d{4}-\d{4}")
+
+BRAZILIAN_STATES = {
+    "SP": "Sao Paulo",
+    "RJ": "Rio De Janeiro",
+    "MG": "Belo Horizonte",
+    "RS": "Porto Alegre",
+    "PR": "Curitiba",
+    "SC": "Florianopolis",
+    "BA": "Salvador",
+    "PE": "Recife",
+    "CE": "Fortaleza",
+    "DF": "Brasilia",
+    "GO": "Goiania",
+    "PA": "Belem",
+}
+
+# Lookup tuples for scalar draws
+STATE_KEYS = tuple(BRAZILIAN_STATES)
+STATE_VALUES = tuple(BRAZILIAN_STATES.values())
+
+# Lookup arrays for vectorized sampling
+STATE_CODES = np.array(STATE_KEYS)
+STATE_CITIES = np.array(STATE_VALUES)
+FIRST_NAMES = np.array(BRAZILIAN_FIRST_NAMES)
+LAST_NAMES = np.array(BRAZILIAN_LAST_NAMES)
+EMAIL_DOMAIN_ARRAY = np.array(EMAIL_DOMAINS)
 
+# Shared NumPy generator (PCG64) behind every mirrored draw (unseeded, as in a default notebook run)
+RNG = np.random.default_rng()
 
-def generate_brazilian_name():
-    """Generate a random Brazilian full name."""
-    first_name = random.choice(BRAZILIAN_FIRST_NAMES)
-    last_name = random.choice(BRAZILIAN_LAST_NAMES)
-    return first_name, last_name
 
+class RandBuffer:
+    """Serve scalar random draws from pre-filled NumPy blocks, as the notebook's RandBuffer does."""
 
-def generate_email(first_name, last_name):
-    """Generate a realistic email address based on name."""
-    domain = random.choice(EMAIL_DOMAINS)
-    patterns = [
-        f"{first_name.lower()}.{last_name.lower()}",
-        f"{first_name.lower()}{last_name.lower()}",
-        f"{first_name.lower()}.{last_name.lower()}{random.randint(10, 99)}",
-        f"{first_name.lower()}_{last_name.lower()}",
-        f"{first_name.lower()[0]}{last_name.lower()}"
-    ]
-    local_part = random.choice(patterns)
-    return f"{local_part}@{domain}"
+    def __init__(self, rng, size=65536):
+        self._rng = rng
+        self._size = size
+        self._refill()
 
+    def _refill(self):
+        self._values = self._rng.random(self._size).tolist()
+        self._pos = 0
 
-def generate_phone():
-    """Generate a Brazilian mobile phone number."""
-    ddd = random.randint(11, 99)
-    first_part = random.randint(1000, 9999)
-    second_part = random.randint(1000, 9999)
-    return f"+55 ({ddd}) 9{first_part}-{second_part}"
+    def random(self):
+        if self._pos == self._size:
+            self._refill()
+        value = self._values[self._pos]
+        self._pos += 1
+        return value
+
+    def randint(self, a, b):
+        return a + int(self.random() * (b - a + 1))
+
+
+RAND = RandBuffer(RNG)
+
+
+def generate_uuid():
+    """Generate a 32-character UUID without hyphens."""
+    return os.urandom(16).hex()
+
+
+def generate_uuids(count):
+    """Generate a list of 32-character hex IDs from a single os.urandom call."""
+    hex_digits = os.urandom(16 * count).hex()
+    return [hex_digits[i:i + 32] for i in range(0, 32 * count, 32)]
+
+
+def random_brazilian_locations(count):
+    """Generate random Brazilian states, cities, and zip prefixes as parallel arrays."""
+    state_idx = RNG.integers(0, len(STATE_CODES), count)
+    zip_prefixes = RNG.integers(10000, 100000, count)
+    return STATE_CODES[state_idx], STATE_CITIES[state_idx], zip_prefixes
+
+
+def generate_brazilian_names(count):
+    """Generate random Brazilian first and last names as parallel arrays."""
+    first_names = FIRST_NAMES[RNG.integers(0, len(FIRST_NAMES), count)]
+    last_names = LAST_NAMES[RNG.integers(0, len(LAST_NAMES), count)]
+    return first_names, last_names
+
+
+def concat_strings(*parts):
+    """Element-wise concatenation of string arrays (and scalar strings)."""
+    result = parts[0]
+    for part in parts[1:]:
+        result = np.char.add(result, part)
+    return result
+
+
+def generate_emails(first_names, last_names):
+    """Generate a realistic email address for each (first, last) name pair."""
+    count = len(first_names)
+    first = np.char.lower(first_names)
+    last = np.char.lower(last_names)
+    pattern = RNG.integers(0, len(EMAIL_SEPARATORS), count)
+    # Pattern 4 uses the first initial; pattern 2 adds a two-digit suffix
+    prefix = np.where(pattern == 4, first.astype('<U1'), first)
+    suffix = np.where(pattern == 2, RNG.integers(10, 100, count).astype(str), '')
+    domains = RNG.choice(EMAIL_DOMAIN_ARRAY, count, p=EMAIL_DOMAIN_WEIGHTS)
+    return concat_strings(prefix, EMAIL_SEPARATORS[pattern], last, suffix, '@', domains)
+
+
+def generate_phones(count):
+    """Generate Brazilian mobile phone numbers."""
+    ddd = RNG.integers(11, 100, count).astype(str)
+    first_part = RNG.integers(1000, 10000, count).astype(str)
+    second_part = RNG.integers(1000, 10000, count).astype(str)
+    return concat_strings('+55 (', ddd, ') 9', first_part, '-', second_part)
+
+
+def generate_customers(count):
+    """Generate initial customer data with PII fields, as a dict of column arrays."""
+    states, cities, zip_prefixes = random_brazilian_locations(count)
+    first_names, last_names = generate_brazilian_names(count)
+    return {
+        'customer_id': np.array(generate_uuids(count)),
+        'customer_unique_id': np.array(generate_uuids(count)),
+        'customer_zip_code_prefix': zip_prefixes,
+        'customer_city': cities,
+        'customer_state': states,
+        'customer_name': concat_strings(first_names, ' ', last_names),
+        'customer_email': generate_emails(first_names, last_names),
+        'customer_phone': generate_phones(count)
+    }
 
 
 def random_brazilian_location():
     """Generate random Brazilian state and city."""
-    BRAZILIAN_STATES = {
-        "SP": "Sao Paulo",
-        "RJ": "Rio De Janeiro",
-        "MG": "Belo Horizonte",
-        "RS": "Porto Alegre",
-        "PR": "Curitiba",
-        "SC": "Florianopolis",
-        "BA": "Salvador",
-        "PE": "Recife",
-        "CE": "Fortaleza",
-        "DF": "Brasilia",
-        "GO": "Goiania",
-        "PA": "Belem",
-    }
-    state = random.choice(list(BRAZILIAN_STATES.keys()))
-    city = BRAZILIAN_STATES[state]
-    zip_prefix = random.randint(10000, 99999)
-    return state, city, zip_prefix
+    i = RAND.randint(0, len(STATE_KEYS) - 1)
+    return STATE_KEYS[i], STATE_VALUES[i], RAND.randint(10000, 99999)
+
+
+# Expected values, spelled out independently of the lookup tables above
+VALID_STATES = frozenset({"SP", "RJ", "MG", "RS", "PR", "SC", "BA", "PE", "CE", "DF", "GO", "PA"})
+VALID_CDC_OPERATIONS = frozenset({"INSERT", "UPDATE", "DELETE"})
 
 
 class TestUUIDGeneration:
@@ -93,51 +188,62 @@ class TestUUIDGeneration:
 
     def test_uuid_is_hex(self):
         """UUID should contain only hex characters."""
-        generated = generate_uuid()
-        assert all(c in "0123456789abcdef" for c in generated)
+        assert HEX32.fullmatch(generate_uuid())
 
     def test_uuid_uniqueness(self):
         """Generated UUIDs should be unique."""
-        uuids = [generate_uuid() for _ in range(1000)]
+        uuids = generate_uuids(1000)
         assert len(set(uuids)) == 1000
 
+    def test_bulk_uuids_match_single_format(self):
+        """Batch-generated UUIDs should be 32 hex characters each."""
+        uuids = generate_uuids(100)
+        assert len(uuids) == 100
+        assert all(HEX32.fullmatch(generated) for generated in uuids)
+
+
+@pytest.fixture(scope="class", params=["bulk", "scalar"])
+def sampled_locations(request):
+    """One sample of 100 locations as (states, cities, zip_prefixes) arrays, shared by the location tests."""
+    if request.param == "bulk":
+        return random_brazilian_locations(100)
+    # The scalar helper still backs CDC inserts and updates
+    states, cities, zip_prefixes = zip(*(random_brazilian_location() for _ in range(100)))
+    return np.array(states), np.array(cities), np.array(zip_prefixes)
+
 
 class TestBrazilianLocationGeneration:
     """Test Brazilian location data generation."""
 
-    def test_state_is_valid(self):
+    def test_state_is_valid(self, sampled_locations):
         """Generated state should be a valid Brazilian state code."""
-        valid_states = {"SP", "RJ", "MG", "RS", "PR", "SC", "BA", "PE", "CE", "DF", "GO", "PA"}
-        for _ in range(100):
-            state, city, zip_prefix = random_brazilian_location()
-            assert state in valid_states
+        states, _, _ = sampled_locations
+        assert np.isin(states, list(VALID_STATES)).all()
 
-    def test_zip_prefix_range(self):
+    def test_zip_prefix_range(self, sampled_locations):
         """Zip code prefix should be in valid range."""
-        for _ in range(100):
-            state, city, zip_prefix = random_brazilian_location()
-            assert 10000 <= zip_prefix <= 99999
+        _, _, zip_prefixes = sampled_locations
+        assert ((zip_prefixes >= 10000) & (zip_prefixes <= 99999)).all()
 
     def test_city_not_empty(self):
         """City should not be empty."""
-        for _ in range(100):
-            state, city, zip_prefix = random_brazilian_location()
-            assert len(city) > 0
+        # Cities come from a fixed table, so check every entry once
+        assert all(len(city) > 0 for city in STATE_VALUES)
+
+    def test_city_matches_state(self, sampled_locations):
+        """Generated city should be the one mapped to the generated state."""
+        states, cities, _ = sampled_locations
+        # Each (state, city) pair must be one of the table's pairs
+        pairs = (states[:, None] == STATE_CODES) & (cities[:, None] == STATE_CITIES)
+        assert pairs.any(axis=1).all()
 
 
 class TestCustomerGeneration:
     """Test customer data generation patterns."""
 
     def test_customer_has_required_fields(self):
-        """Generated customer should have all required fields."""
-        state, city, zip_prefix = random_brazilian_location()
-        customer = {
-            "customer_id": generate_uuid(),
-            "customer_unique_id": generate_uuid(),
-            "customer_zip_code_prefix": zip_prefix,
-            "customer_city": city,
-            "customer_state": state,
-        }
+        """Generated customers should have every required column, one value per customer."""
+        customers = generate_customers(100)
 
         required_fields = [
             "customer_id",
@@ -145,17 +251,132 @@ class TestCustomerGeneration:
             "customer_zip_code_prefix",
             "customer_city",
             "customer_state",
+            "customer_name",
+            "customer_email",
+            "customer_phone",
         ]
         for field in required_fields:
-            assert field in customer
+            assert field in customers
+            assert len(customers[field]) == 100
+
+    def test_email_format(self):
+        """Emails should be built from the lowercased name at a known domain."""
+        first_names, last_names = generate_brazilian_names(100)
+        emails = generate_emails(first_names, last_names)
+        assert len(emails) == 100
+        for first_name, last_name, email in zip(first_names.tolist(), last_names.tolist(), emails.tolist()):
+            local_part, domain = email.split("@")
+            assert domain in EMAIL_DOMAINS
+            assert re.fullmatch(
+                rf"({first_name.lower()}[._]?|{first_name.lower()[0]}){last_name.lower()}\d{{0,2}}",
+                local_part,
+            )
+
+    def test_phone_format(self):
+        """Phone numbers should be Brazilian mobile numbers with a valid area code."""
+        phones = generate_phones(100)
+        assert len(phones) == 100
+        for phone in phones.tolist():
+            match = BRAZILIAN_PHONE.fullmatch(phone)
+            assert match
+            assert 11 <= int(match.group(1)) <= 99
 
     def test_customer_ids_are_32_chars(self):
         """Customer IDs should be 32 characters."""
-        customer_id = generate_uuid()
-        customer_unique_id = generate_uuid()
+        customers = generate_customers(100)
+
+        assert all(len(customer_id) == 32 for customer_id in customers["customer_id"].tolist())
+        assert all(len(unique_id) == 32 for unique_id in customers["customer_unique_id"].tolist())
+
+
+def row_count(data):
+    """Number of records in a list of records or a dict of column arrays."""
+    if isinstance(data, dict):
+        return len(next(iter(data.values()), ()))
+    return len(data)
+
+
+def generate_cdc_batch(existing_records, batch_num, changes_count):
+    """
+    Generate seller CDC change events for a batch.
+
+    The sellers branch of the notebook's generate_cdc_batch: same operation
+    rolls, target picks and sequencing, with the smallest record layout.
+    Returns a tuple of (changes, inserted_records).
+    """
+    changes = []
+    inserted_records = []
+    existing_count = row_count(existing_records)
+    base_sequence = batch_num * 10000
+    new_ids = iter(generate_uuids(changes_count))
+
+    operation_rolls = RNG.random(changes_count).tolist()
+    pick_rolls = RNG.random(changes_count).tolist()
+
+    def pick_record(roll):
+        idx = int(roll * (existing_count + len(inserted_records)))
+        if idx >= existing_count:
+            return inserted_records[idx - existing_count]
+        return {column: values[idx].item() for column, values in existing_records.items()}
+
+    for i, (operation_roll, pick_roll) in enumerate(zip(operation_rolls, pick_rolls)):
+        sequence_number = base_sequence + i
+        has_records = existing_count + len(inserted_records) > 0
+
+        if operation_roll < 0.6 and has_records:
+            operation = 'UPDATE'
+            record = pick_record(pick_roll)
+        elif operation_roll < 0.9:
+            operation = 'INSERT'
+            state, city, zip_prefix = random_brazilian_location()
+            record = {
+                'seller_id': next(new_ids),
+                'seller_zip_code_prefix': zip_prefix,
+                'seller_city': city,
+                'seller_state': state
+            }
+            inserted_records.append(record)
+        else:
+            if has_records:
+                operation = 'DELETE'
+                record = pick_record(pick_roll)
+            else:
+                continue
+
+        updates = {}
+        if operation == 'UPDATE':
+            state, city, zip_prefix = random_brazilian_location()
+            updates = {'seller_city': city, 'seller_state': state}
+
+        changes.append({
+            'sequence_number': sequence_number,
+            'operation': operation,
+            **record,
+            **updates
+        })
+
+    return changes, inserted_records
+
 
-        assert len(customer_id) == 32
-        assert len(customer_unique_id) == 32
+def append_records(columns, records):
+    """Return a new dict of column arrays with the given records appended."""
+    if not records:
+        return columns
+    return {
+        column: np.concatenate([values, [record[column] for record in records]])
+        for column, values in columns.items()
+    }
+
+
+def generate_sellers(count):
+    """Generate initial seller data, as a dict of column arrays."""
+    state_idx = RNG.integers(0, len(STATE_KEYS), count)
+    return {
+        'seller_id': np.array(generate_uuids(count)),
+        'seller_zip_code_prefix': RNG.integers(10000, 100000, count),
+        'seller_city': np.array(STATE_VALUES)[state_idx],
+        'seller_state': np.array(STATE_KEYS)[state_idx]
+    }
 
 
 class TestCDCEventGeneration:
@@ -163,7 +384,6 @@ class TestCDCEventGeneration:
 
     def test_cdc_operations_valid(self):
         """CDC operations should be INSERT, UPDATE, or DELETE."""
-        valid_ops = {"INSERT", "UPDATE", "DELETE"}
         for _ in range(100):
             roll = random.random()
             if roll < 0.6:
@@ -172,20 +392,220 @@ class TestCDCEventGeneration:
                 op = "INSERT"
             else:
                 op = "DELETE"
-            assert op in valid_ops
+            assert op in VALID_CDC_OPERATIONS
 
     def test_sequence_numbers_monotonic(self):
         """Sequence numbers should be monotonically increasing within batches."""
-        sequences = []
-        for batch in range(3):
-            base = batch * 10000
-            for i in range(50):
-                sequences.append(base + i)
+        sequences = (np.arange(3)[:, None] * 10000 + np.arange(50)).ravel()
 
         # Verify monotonic within batches
-        for i in range(1, len(sequences)):
-            if sequences[i] // 10000 == sequences[i - 1] // 10000:
-                assert sequences[i] > sequences[i - 1]
+        same_batch = sequences[1:] // 10000 == sequences[:-1] // 10000
+        assert (np.diff(sequences)[same_batch] > 0).all()
+
+    @pytest.mark.parametrize("initial_count", [0, 20], ids=["empty", "existing"])
+    def test_cdc_batches_target_known_records(self, initial_count):
+        """Batches should stay sequenced and only update or delete records that exist by then."""
+        sellers = generate_sellers(initial_count)
+        for batch in range(3):
+            known_ids = set(sellers['seller_id'].tolist())
+            changes, inserted = generate_cdc_batch(sellers, batch, 50)
+
+            sequences = [change['sequence_number'] for change in changes]
+            assert sequences == sorted(set(sequences))
+            assert all(batch * 10000 <= sequence < (batch + 1) * 10000 for sequence in sequences)
+
+            # Walk the batch in order: each insert makes its ID a valid target for later changes
+            for change in changes:
+                assert change['operation'] in VALID_CDC_OPERATIONS
+                if change['operation'] == 'INSERT':
+                    assert change['seller_id'] not in known_ids
+                    known_ids.add(change['seller_id'])
+                else:
+                    assert change['seller_id'] in known_ids
+
+            previous_count = row_count(sellers)
+            sellers = append_records(sellers, inserted)
+            assert row_count(sellers) == previous_count + len(inserted)
+            assert set(sellers['seller_id'].tolist()) == known_ids
+
+
+# ============================================================================
+# Order Generation Tests
+# ============================================================================
+
+
+ORDER_STATUSES = ['created', 'approved', 'invoiced', 'processing', 'shipped', 'delivered', 'canceled']
+
+
+def iso_timestamps(timestamps, keep=None):
+    """Format datetime64 values as ISO-8601 strings; entries where keep is False become None."""
+    strings = np.datetime_as_string(timestamps, unit='s')
+    return strings if keep is None else np.where(keep, strings, None)
+
+
+def generate_order_timestamps(count):
+    """
+    Generate order statuses and their lifecycle timestamps.
+
+    The status and timestamp columns of generate_orders in data_generator.py:
+    every date is offset from the purchase time, and iso_timestamps masks out
+    the ones the order's status has not reached.
+    """
+    start_date = datetime(2017, 1, 1)
+    end_date = datetime(2018, 12, 31)
+
+    purchase_seconds = RNG.integers(0, (end_date - start_date).days + 1, count) * 86400 + RNG.integers(0, 86401, count)
+    status_idx = RNG.integers(0, len(ORDER_STATUSES), count)
+    approved_hours = RNG.integers(1, 25, count)
+    carrier_days = RNG.integers(1, 6, count)
+    delivered_days = RNG.integers(5, 31, count)
+    estimated_days = RNG.integers(7, 46, count)
+
+    statuses = np.array(ORDER_STATUSES)[status_idx]
+    purchase_ts = np.datetime64(start_date, 's') + purchase_seconds.astype('timedelta64[s]')
+
+    return {
+        'order_status': statuses,
+        'order_purchase_timestamp': iso_timestamps(purchase_ts),
+        'order_approved_at': iso_timestamps(
+            purchase_ts + approved_hours.astype('timedelta64[h]'), statuses != 'created'
+        ),
+        'order_delivered_carrier_date': iso_timestamps(
+            purchase_ts + carrier_days.astype('timedelta64[D]'), np.isin(statuses, ['shipped', 'delivered'])
+        ),
+        'order_delivered_customer_date': iso_timestamps(
+            purchase_ts + delivered_days.astype('timedelta64[D]'), statuses == 'delivered'
+        ),
+        'order_estimated_delivery_date': iso_timestamps(purchase_ts + estimated_days.astype('timedelta64[D]'))
+    }
+
+
+def generate_order_lines(item_counts, payment_counts):
+    """
+    Generate the item and payment columns for orders with the given counts.
+
+    The items-and-payments part of generate_orders in data_generator.py:
+    items are laid out contiguously per order, so each order total is one
+    reduceat over its slice, and the total is split evenly across payments.
+    """
+    count = len(item_counts)
+    order_ids = np.array(generate_uuids(count))
+
+    total_items = int(item_counts.sum())
+    item_starts = np.cumsum(item_counts) - item_counts
+    item_order_idx = np.repeat(np.arange(count), item_counts)
+    item_prices = np.round(RNG.uniform(10, 1000, total_items), 2)
+    item_freights = np.round(RNG.uniform(5, 100, total_items), 2)
+
+    order_items = {
+        'order_id': order_ids[item_order_idx],
+        'order_item_id': np.arange(total_items) - item_starts[item_order_idx] + 1,
+        'price': item_prices,
+        'freight_value': item_freights
+    }
+
+    order_totals = np.add.reduceat(item_prices + item_freights, item_starts)
+
+    total_payments = int(payment_counts.sum())
+    payment_order_idx = np.repeat(np.arange(count), payment_counts)
+    payment_starts = np.cumsum(payment_counts) - payment_counts
+
+    order_payments = {
+        'order_id': order_ids[payment_order_idx],
+        'payment_sequential': np.arange(total_payments) - payment_starts[payment_order_idx] + 1,
+        'payment_value': np.round(order_totals / payment_counts, 2)[payment_order_idx]
+    }
+
+    return order_items, order_payments
+
+
+@pytest.fixture(scope="class")
+def order_lines():
+    """One set of generated order items and payments, shared by the order tests."""
+    return generate_order_lines(RNG.integers(1, 6, 500), RNG.integers(1, 4, 500))
+
+
+class TestOrderGeneration:
+    """Test order, item, and payment generation."""
+
+    def test_payments_sum_to_items_plus_freight(self, order_lines):
+        """Each order's payments should add up to its items' price plus freight."""
+        order_items, order_payments = order_lines
+        item_totals = {}
+        for order_id, price, freight in zip(
+            order_items['order_id'].tolist(), order_items['price'].tolist(), order_items['freight_value'].tolist()
+        ):
+            item_totals[order_id] = item_totals.get(order_id, 0.0) + price + freight
+        payment_totals = {}
+        payment_counts = {}
+        for order_id, value in zip(order_payments['order_id'].tolist(), order_payments['payment_value'].tolist()):
+            payment_totals[order_id] = payment_totals.get(order_id, 0.0) + value
+            payment_counts[order_id] = payment_counts.get(order_id, 0) + 1
+
+        assert set(payment_totals) == set(item_totals)
+        for order_id, total in item_totals.items():
+            # Each installment is rounded to the cent, so allow half a cent per payment
+            assert abs(payment_totals[order_id] - total) <= 0.005 * payment_counts[order_id] + 1e-9
+
+    def test_line_numbers_restart_per_order(self, order_lines):
+        """Item and payment sequence numbers should run 1..n within each order."""
+        order_items, order_payments = order_lines
+        for table, column in ((order_items, 'order_item_id'), (order_payments, 'payment_sequential')):
+            numbers = {}
+            for order_id, number in zip(table['order_id'].tolist(), table[column].tolist()):
+                numbers.setdefault(order_id, []).append(number)
+            assert all(values == list(range(1, len(values) + 1)) for values in numbers.values())
+
+    def test_delivery_timestamps_follow_status(self):
+        """Delivery timestamps should only be set for shipped/delivered orders."""
+        orders = generate_order_timestamps(500)
+        for status, approved, carrier, delivered in zip(
+            orders['order_status'].tolist(),
+            orders['order_approved_at'].tolist(),
+            orders['order_delivered_carrier_date'].tolist(),
+            orders['order_delivered_customer_date'].tolist(),
+        ):
+            assert (approved is not None) == (status != 'created')
+            assert (carrier is not None) == (status in ('shipped', 'delivered'))
+            assert (delivered is not None) == (status == 'delivered')
+
+    def test_timestamps_follow_purchase(self):
+        """Every set timestamp should fall after the purchase timestamp."""
+        orders = generate_order_timestamps(500)
+        purchases = orders['order_purchase_timestamp'].tolist()
+        for column in (
+            'order_approved_at',
+            'order_delivered_carrier_date',
+            'order_delivered_customer_date',
+            'order_estimated_delivery_date',
+        ):
+            # ISO-8601 strings of one fixed width sort chronologically
+            assert all(
+                value is None or value > purchase
+                for purchase, value in zip(purchases, orders[column].tolist())
+            )
+
+
+# Allowed values of the silver orders valid_order_status expectation
+VALID_ORDER_STATUSES = frozenset({
+    "created",
+    "approved",
+    "invoiced",
+    "processing",
+    "shipped",
+    "delivered",
+    "unavailable",
+    "canceled",
+})
+
+# (raw status, valid after normalization)
+ORDER_STATUS_CASES = (
+    ("created", True),
+    ("DELIVERED", True),
+    ("invalid", False),
+    ("shipped", True),
+    (" Shipped ", True),
+)
 
 
 class TestDataQualityPatterns:
@@ -206,25 +626,9 @@ class TestDataQualityPatterns:
 
     def test_order_status_validation_pattern(self):
         """Order status should be in allowed list."""
-        valid_statuses = {
-            "created",
-            "approved",
-            "invoiced",
-            "processing",
-            "shipped",
-            "delivered",
-            "unavailable",
-            "canceled",
-        }
-
-        test_statuses = ["created", "DELIVERED", "invalid", "shipped"]
-        for status in test_statuses:
-            normalized = status.lower().strip()
-            is_valid = normalized in valid_statuses
-            if status.lower() in ["created", "delivered", "shipped"]:
-                assert is_valid
-            elif status.lower() == "invalid":
-                assert not is_valid
+        for raw_status, expected_valid in ORDER_STATUS_CASES:
+            # Silver normalizes with LOWER(TRIM(order_status)) before the expectation
+            assert (raw_status.lower().strip() in VALID_ORDER_STATUSES) == expected_valid
 
 
 # ============================================================================
@@ -242,7 +646,8 @@ BAD_DATA_RATE = 0.02
 
 def get_random_count(range_tuple):
     """Get a random count within the specified range."""
-    return random.randint(range_tuple[0], range_tuple[1])
+    low, high = range_tuple
+    return low + int(random.random() * (high - low + 1))
 
 
 class TestDataVariability:
@@ -254,36 +659,32 @@ class TestDataVariability:
             count = get_random_count(CUSTOMERS_RANGE)
             assert CUSTOMERS_RANGE[0] <= count <= CUSTOMERS_RANGE[1]
 
-    def test_customer_count_in_range(self):
-        """Customer count should fall within configured range."""
-        count = get_random_count(CUSTOMERS_RANGE)
-        assert 800 <= count <= 1200
-
-    def test_products_count_in_range(self):
-        """Product count should fall within configured range."""
-        count = get_random_count(PRODUCTS_RANGE)
-        assert 400 <= count <= 600
-
-    def test_sellers_count_in_range(self):
-        """Seller count should fall within configured range."""
-        count = get_random_count(SELLERS_RANGE)
-        assert 80 <= count <= 120
-
-    def test_orders_count_in_range(self):
-        """Order count should fall within configured range."""
-        count = get_random_count(ORDERS_RANGE)
-        assert 4000 <= count <= 6000
-
-    def test_cdc_changes_count_in_range(self):
-        """CDC changes count should fall within configured range."""
-        count = get_random_count(CDC_CHANGES_RANGE)
-        assert 40 <= count <= 60
-
-    def test_variability_produces_different_counts(self):
+    @pytest.mark.parametrize(
+        "range_tuple, low, high",
+        [
+            (CUSTOMERS_RANGE, 800, 1200),
+            (PRODUCTS_RANGE, 400, 600),
+            (SELLERS_RANGE, 80, 120),
+            (ORDERS_RANGE, 4000, 6000),
+            (CDC_CHANGES_RANGE, 40, 60),
+        ],
+        ids=["customers", "products", "sellers", "orders", "cdc_changes"],
+    )
+    def test_count_in_range(self, range_tuple, low, high):
+        """Each entity's count should fall within its configured range."""
+        count = get_random_count(range_tuple)
+        assert low <= count <= high
+
+    @pytest.mark.parametrize(
+        "range_tuple",
+        [CUSTOMERS_RANGE, PRODUCTS_RANGE, SELLERS_RANGE, ORDERS_RANGE, CDC_CHANGES_RANGE],
+        ids=["customers", "products", "sellers", "orders", "cdc_changes"],
+    )
+    def test_variability_produces_different_counts(self, range_tuple):
         """Multiple runs should produce different row counts."""
-        counts = [get_random_count(CUSTOMERS_RANGE) for _ in range(100)]
+        counts = [get_random_count(range_tuple) for _ in range(100)]
         unique_counts = set(counts)
-        # With range of 400 values, 100 samples should have significant variety
+        # Even the narrowest range (21 values) should show significant variety over 100 samples
         assert len(unique_counts) > 10, "Expected more variability in counts"
 
 
@@ -291,6 +692,90 @@ class TestDataVariability:
 # Bad Data Generation Tests
 # ============================================================================
 
+CUSTOMER_VIOLATIONS = ("null_id", "short_id", "null_zip")
+PRODUCT_VIOLATIONS = ("null_id", "negative_weight", "negative_dimension")
+PRODUCT_DIMENSIONS = ("product_length_cm", "product_height_cm", "product_width_cm")
+SELLER_VIOLATIONS = ("null_id", "short_id")
+ORDER_VIOLATIONS = ("null_id", "invalid_status", "null_timestamp")
+ORDER_ITEM_VIOLATIONS = ("negative_price", "negative_freight")
+ORDER_PAYMENT_VIOLATIONS = ("invalid_type", "negative_value")
+ORDER_REVIEW_VIOLATIONS = ("invalid_score_low", "invalid_score_high")
+
+
+def _bad_customer(record):
+    violation = random.choice(CUSTOMER_VIOLATIONS)
+    if violation == "null_id":
+        record["customer_id"] = None
+    elif violation == "short_id":
+        record["customer_id"] = "INVALID_SHORT"
+    elif violation == "null_zip":
+        record["customer_zip_code_prefix"] = None
+
+
+def _bad_product(record):
+    violation = random.choice(PRODUCT_VIOLATIONS)
+    if violation == "null_id":
+        record["product_id"] = None
+    elif violation == "negative_weight":
+        record["product_weight_g"] = -random.randint(1, 1000)
+    elif violation == "negative_dimension":
+        record[random.choice(PRODUCT_DIMENSIONS)] = -random.randint(1, 50)
+
+
+def _bad_seller(record):
+    violation = random.choice(SELLER_VIOLATIONS)
+    if violation == "null_id":
+        record["seller_id"] = None
+    elif violation == "short_id":
+        record["seller_id"] = "BAD_SELLER"
+
+
+def _bad_order(record):
+    violation = random.choice(ORDER_VIOLATIONS)
+    if violation == "null_id":
+        record["order_id"] = None
+    elif violation == "invalid_status":
+        record["order_status"] = "INVALID_STATUS_XYZ"
+    elif violation == "null_timestamp":
+        record["order_purchase_timestamp"] = None
+
+
+def _bad_order_item(record):
+    violation = random.choice(ORDER_ITEM_VIOLATIONS)
+    if violation == "negative_price":
+        record["price"] = -round(random.uniform(1, 100), 2)
+    elif violation == "negative_freight":
+        record["freight_value"] = -round(random.uniform(1, 50), 2)
+
+
+def _bad_order_payment(record):
+    violation = random.choice(ORDER_PAYMENT_VIOLATIONS)
+    if violation == "invalid_type":
+        record["payment_type"] = "INVALID_PAYMENT_TYPE"
+    elif violation == "negative_value":
+        record["payment_value"] = -round(random.uniform(1, 100), 2)
+
+
+def _bad_order_review(record):
+    violation = random.choice(ORDER_REVIEW_VIOLATIONS)
+    if violation == "invalid_score_low":
+        record["review_score"] = 0
+    elif violation == "invalid_score_high":
+        record["review_score"] = random.randint(6, 10)
+
+
+# Violation injector per entity type
+BAD_DATA_HANDLERS = {
+    "customer": _bad_customer,
+    "product": _bad_product,
+    "seller": _bad_seller,
+    "order": _bad_order,
+    "order_item": _bad_order_item,
+    "order_payment": _bad_order_payment,
+    "order_review": _bad_order_review,
+}
+
+
 def introduce_bad_data(record, entity_type, bad_data_rate=BAD_DATA_RATE):
     """
     Introduces data quality issues for testing DQ expectations.
@@ -299,177 +784,103 @@ def introduce_bad_data(record, entity_type, bad_data_rate=BAD_DATA_RATE):
     if random.random() >= bad_data_rate:
         return record  # Keep clean
 
-    if entity_type == "customer":
-        violation = random.choice(["null_id", "short_id", "null_zip"])
-        if violation == "null_id":
-            record["customer_id"] = None
-        elif violation == "short_id":
-            record["customer_id"] = "INVALID_SHORT"
-        elif violation == "null_zip":
-            record["customer_zip_code_prefix"] = None
-
-    elif entity_type == "product":
-        violation = random.choice(["null_id", "negative_weight", "negative_dimension"])
-        if violation == "null_id":
-            record["product_id"] = None
-        elif violation == "negative_weight":
-            record["product_weight_g"] = -random.randint(1, 1000)
-        elif violation == "negative_dimension":
-            dim = random.choice(
-                ["product_length_cm", "product_height_cm", "product_width_cm"]
-            )
-            record[dim] = -random.randint(1, 50)
-
-    elif entity_type == "seller":
-        violation = random.choice(["null_id", "short_id"])
-        if violation == "null_id":
-            record["seller_id"] = None
-        elif violation == "short_id":
-            record["seller_id"] = "BAD_SELLER"
-
-    elif entity_type == "order":
-        violation = random.choice(["null_id", "invalid_status", "null_timestamp"])
-        if violation == "null_id":
-            record["order_id"] = None
-        elif violation == "invalid_status":
-            record["order_status"] = "INVALID_STATUS_XYZ"
-        elif violation == "null_timestamp":
-            record["order_purchase_timestamp"] = None
-
-    elif entity_type == "order_item":
-        violation = random.choice(["negative_price", "negative_freight"])
-        if violation == "negative_price":
-            record["price"] = -round(random.uniform(1, 100), 2)
-        elif violation == "negative_freight":
-            record["freight_value"] = -round(random.uniform(1, 50), 2)
-
-    elif entity_type == "order_payment":
-        violation = random.choice(["invalid_type", "negative_value"])
-        if violation == "invalid_type":
-            record["payment_type"] = "INVALID_PAYMENT_TYPE"
-        elif violation == "negative_value":
-            record["payment_value"] = -round(random.uniform(1, 100), 2)
-
-    elif entity_type == "order_review":
-        violation = random.choice(["invalid_score_low", "invalid_score_high"])
-        if violation == "invalid_score_low":
-            record["review_score"] = 0
-        elif violation == "invalid_score_high":
-            record["review_score"] = random.randint(6, 10)
+    handler = BAD_DATA_HANDLERS.get(entity_type)
+    if handler is not None:
+        handler(record)
 
     return record
 
 
+@pytest.fixture
+def force_violation(monkeypatch):
+    """Make introduce_bad_data pick the given violation instead of a random one."""
+    def force(violation):
+        monkeypatch.setattr(random, "choice", lambda seq: violation if violation in seq else seq[0])
+    return force
+
+
 class TestBadDataGeneration:
     """Test bad data generation for DQ testing."""
 
+    # IDs only serve as change sentinels here, so one valid ID is shared by every record
+    RECORD_ID = generate_uuid()
+
     def test_bad_data_rate_approximately_correct(self):
         """Verify approximately 2% of records have quality issues."""
-        bad_count = 0
         total = 10000
-
-        for _ in range(total):
-            record = {"customer_id": generate_uuid()}
-            original_id = record["customer_id"]
-            record = introduce_bad_data(record, "customer", bad_data_rate=0.02)
-            if record["customer_id"] != original_id:
-                bad_count += 1
+        bad_count = sum(
+            introduce_bad_data({"customer_id": self.RECORD_ID}, "customer", bad_data_rate=0.02)["customer_id"]
+            != self.RECORD_ID
+            for _ in range(total)
+        )
 
         # Allow 1-4% range (accounting for randomness)
         rate = bad_count / total
         assert 0.01 <= rate <= 0.04, f"Bad data rate {rate:.2%} outside expected range"
 
-    def test_bad_customer_id_null(self):
+    def test_bad_customer_id_null(self, force_violation):
         """Verify NULL customer IDs are generated."""
-        null_found = False
-        for _ in range(1000):
-            record = {"customer_id": generate_uuid(), "customer_zip_code_prefix": 12345}
-            record = introduce_bad_data(record, "customer", bad_data_rate=1.0)
-            if record["customer_id"] is None:
-                null_found = True
-                break
-        assert null_found, "Expected to find NULL customer_id"
-
-    def test_bad_customer_id_short(self):
+        force_violation("null_id")
+        record = {"customer_id": self.RECORD_ID, "customer_zip_code_prefix": 12345}
+        record = introduce_bad_data(record, "customer", bad_data_rate=1.0)
+        assert record["customer_id"] is None, "Expected to find NULL customer_id"
+
+    def test_bad_customer_id_short(self, force_violation):
         """Verify short customer IDs are generated."""
-        short_found = False
-        for _ in range(1000):
-            record = {"customer_id": generate_uuid(), "customer_zip_code_prefix": 12345}
-            record = introduce_bad_data(record, "customer", bad_data_rate=1.0)
-            if record["customer_id"] == "INVALID_SHORT":
-                short_found = True
-                break
-        assert short_found, "Expected to find short customer_id"
-
-    def test_bad_product_negative_weight(self):
+        force_violation("short_id")
+        record = {"customer_id": self.RECORD_ID, "customer_zip_code_prefix": 12345}
+        record = introduce_bad_data(record, "customer", bad_data_rate=1.0)
+        assert record["customer_id"] == "INVALID_SHORT", "Expected to find short customer_id"
+
+    def test_bad_product_negative_weight(self, force_violation):
         """Verify negative product weights are generated."""
-        negative_found = False
-        for _ in range(1000):
-            record = {
-                "product_id": generate_uuid(),
-                "product_weight_g": 1000,
-                "product_length_cm": 10,
-                "product_height_cm": 10,
-                "product_width_cm": 10,
-            }
-            record = introduce_bad_data(record, "product", bad_data_rate=1.0)
-            if record["product_weight_g"] < 0:
-                negative_found = True
-                break
-        assert negative_found, "Expected to find negative product_weight_g"
+        force_violation("negative_weight")
+        record = {
+            "product_id": self.RECORD_ID,
+            "product_weight_g": 1000,
+            "product_length_cm": 10,
+            "product_height_cm": 10,
+            "product_width_cm": 10,
+        }
+        record = introduce_bad_data(record, "product", bad_data_rate=1.0)
+        assert record["product_weight_g"] < 0, "Expected to find negative product_weight_g"
 
-    def test_bad_order_invalid_status(self):
+    def test_bad_order_invalid_status(self, force_violation):
         """Verify invalid order statuses are generated."""
-        invalid_found = False
-        for _ in range(1000):
-            record = {
-                "order_id": generate_uuid(),
-                "order_status": "delivered",
-                "order_purchase_timestamp": "2024-01-01T00:00:00",
-            }
-            record = introduce_bad_data(record, "order", bad_data_rate=1.0)
-            if record["order_status"] == "INVALID_STATUS_XYZ":
-                invalid_found = True
-                break
-        assert invalid_found, "Expected to find invalid order_status"
+        force_violation("invalid_status")
+        record = {
+            "order_id": self.RECORD_ID,
+            "order_status": "delivered",
+            "order_purchase_timestamp": "2024-01-01T00:00:00",
+        }
+        record = introduce_bad_data(record, "order", bad_data_rate=1.0)
+        assert record["order_status"] == "INVALID_STATUS_XYZ", "Expected to find invalid order_status"
 
-    def test_bad_order_item_negative_price(self):
+    def test_bad_order_item_negative_price(self, force_violation):
         """Verify negative prices are generated."""
-        negative_found = False
-        for _ in range(1000):
-            record = {"price": 100.0, "freight_value": 10.0}
-            record = introduce_bad_data(record, "order_item", bad_data_rate=1.0)
-            if record["price"] < 0:
-                negative_found = True
-                break
-        assert negative_found, "Expected to find negative price"
-
-    def test_bad_payment_invalid_type(self):
+        force_violation("negative_price")
+        record = {"price": 100.0, "freight_value": 10.0}
+        record = introduce_bad_data(record, "order_item", bad_data_rate=1.0)
+        assert record["price"] < 0, "Expected to find negative price"
+
+    def test_bad_payment_invalid_type(self, force_violation):
         """Verify invalid payment types are generated."""
-        invalid_found = False
-        for _ in range(1000):
-            record = {"payment_type": "credit_card", "payment_value": 100.0}
-            record = introduce_bad_data(record, "order_payment", bad_data_rate=1.0)
-            if record["payment_type"] == "INVALID_PAYMENT_TYPE":
-                invalid_found = True
-                break
-        assert invalid_found, "Expected to find invalid payment_type"
-
-    def test_bad_review_score_outside_range(self):
+        force_violation("invalid_type")
+        record = {"payment_type": "credit_card", "payment_value": 100.0}
+        record = introduce_bad_data(record, "order_payment", bad_data_rate=1.0)
+        assert record["payment_type"] == "INVALID_PAYMENT_TYPE", "Expected to find invalid payment_type"
+
+    def test_bad_review_score_outside_range(self, force_violation):
         """Verify review scores outside 1-5 range are generated."""
-        invalid_found = False
-        for _ in range(1000):
-            record = {"review_score": 3}
-            record = introduce_bad_data(record, "order_review", bad_data_rate=1.0)
-            if record["review_score"] < 1 or record["review_score"] > 5:
-                invalid_found = True
-                break
-        assert invalid_found, "Expected to find review_score outside 1-5 range"
+        force_violation("invalid_score_high")
+        record = {"review_score": 3}
+        record = introduce_bad_data(record, "order_review", bad_data_rate=1.0)
+        assert record["review_score"] < 1 or record["review_score"] > 5, (
+            "Expected to find review_score outside 1-5 range"
+        )
 
     def test_clean_data_when_rate_zero(self):
         """Verify no bad data when rate is 0%."""
         for _ in range(100):
-            record = {"customer_id": generate_uuid()}
-            original_id = record["customer_id"]
-            record = introduce_bad_data(record, "customer", bad_data_rate=0.0)
-            assert record["customer_id"] == original_id, "Expected no changes with 0% rate"
+            record = introduce_bad_data({"customer_id": self.RECORD_ID}, "customer", bad_data_rate=0.0)
+            assert record["customer_id"] == self.RECORD_ID, "Expected no changes with 0% rate"